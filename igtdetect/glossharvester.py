@@ -1,55 +1,113 @@
 import re
 import os
+from collections import defaultdict, deque
+from itertools import islice
+
+# placeholder for fields that could not be found
+NA = 'NA'
+
+# descriptions of the methods used to arrive at an IGT, see IGT.classification_methods
+METHOD_L_TAG = 'IGT initialized by L tag'
+METHOD_GLOSS_TAG = 'updated gloss by tag'
+METHOD_TRANSLATION_TAG = 'updated translation by tag'
+METHOD_ISCORE = 'IGT initialized by iscore L and T assigned accordingly'
+
+_PREFIX_CHARS = frozenset('.(){}[]0123456789')
+_MARKERS = frozenset('*?#%')
+_DOCID_RE = re.compile(r'doc_id=(.*?)-scanned')
+# the attributes of a freki line run up to the first colon, the utterance follows it
+_LINE_RE = re.compile(r'(?P<attributes>[^:]*):(?P<utt>.*)', re.DOTALL)
+# each attribute is looked up on its own, so their order in the line does not matter
+_LINENR_RE = re.compile(r'\bline=(\S+)')
+_LINETAG_RE = re.compile(r'\btag=([^\s:])')
+_ISCORE_RE = re.compile(r'\biscore=([\d.]+)')
 
 def get_utterance(row: str):
-    return row.split(':', 1)[1] if ':' in row else 'NA'
+    '''
+    Returns everything after the first colon of a freki row, which ends the attributes,
+    so colons inside the utterance and the trailing newline are kept
+    '''
+    return row.split(':', 1)[1] if ':' in row else NA
 
 def get_utterance_and_prefix(row: str):
-    utterance = get_utterance(row)
+    return split_prefix(get_utterance(row))
+
+def split_prefix(utterance: str):
     prefix = detect_prefix(utterance)
     if prefix:
-        for pf in prefix:
-            utterance = utterance.replace(pf, '', 1)
+        # the prefix items are the leading words of the utterance
+        parts = utterance.split(None, len(prefix))
+        utterance = parts[-1] if len(parts) > len(prefix) else ''
     return prefix, utterance
 
 def get_linenr(row: str):
-    return row.split('line=')[1].split()[0] if 'line=' in row else 'NA'
+    return row.split('line=')[1].split()[0] if 'line=' in row else NA
 
 def get_linetag(row: str):
-    try:
-        return row.split('tag=')[1][0] if 'tag=' in row else 'NA'
-    except:
-        return 'NA'
+    tag = row.split('tag=', 1)[1][:1] if 'tag=' in row else ''
+    return tag or NA
 
 def get_iscore(row:str):
     return float(row.split('iscore=')[1][0:3]) if 'iscore' in row else 0
 
+def parse_line(row: str):
+    '''
+    Parses the tag, line number, iscore and utterance of a freki line in a single pass
+    falls back to the per-field getters for rows the pattern does not match
+    '''
+    match = _LINE_RE.match(row)
+    if match is None:
+        return get_linetag(row), get_linenr(row), get_iscore(row), get_utterance(row)
+    attributes = match['attributes']
+    linetag = _LINETAG_RE.search(attributes)
+    linenr = _LINENR_RE.search(attributes)
+    iscore = _ISCORE_RE.search(attributes)
+    return (linetag[1] if linetag else NA,
+            linenr[1] if linenr else NA,
+            float(iscore[1][0:3]) if iscore else 0,
+            match['utt'])
+
 def get_context(lines, index, linetype='G', context_size=5):
-    context = ""
+    parts = []
     for i in range(-context_size, context_size):
-        try:
-            context += str(get_utterance(lines[index+i]) + "\n")
-        except:
-            return context
-    return context
+        j = index + i
+        if 0 <= j < len(lines):
+            parts.append(get_utterance(lines[j]))
+    return "\n".join(parts) + "\n" if parts else ""
+
+def iter_window(rows, before=5, after=4):
+    '''
+    Iterates over rows while keeping only a bounded window of them in memory
+    yields the window together with the index of the current row in it,
+    so that up to `before` preceding and `after` following rows can be looked up
+    the defaults cover the rows used by get_context
+    '''
+    rows = iter(rows)
+    window = deque(islice(rows, after + 1), maxlen=before + after + 1)
+    i = 0
+    while i < len(window):
+        yield window, i
+        row = next(rows, None)
+        # once the window is full, appending drops the oldest row
+        # and the next row to process ends up at the same index
+        if row is None or len(window) < window.maxlen:
+            i += 1
+        if row is not None:
+            window.append(row)
 
 def detect_prefix(line: str):
     '''
     Detects the presence of a prefix in a line and returns the prefix
     If a prefix is found, it looks ahead to scan for double prefixes
+    Returns an empty list if there is no prefix, or if every word of the line looks like one
     '''
-    punctuation_pattern = r'[.\(\)\{\}\[\]]'
-    number_pattern = r'\d+'
     prefix = []
-    words = line.split()
-    for item in words:
-        punctuations = re.findall(punctuation_pattern, item)
-        numerals = re.findall(number_pattern, item)
-        if (punctuations or numerals) and len(item) < 6:
+    for item in line.split():
+        if len(item) < 6 and not _PREFIX_CHARS.isdisjoint(item):
             prefix.append(item)
         else:
             return prefix
-    return None
+    return []
 
 def detect_grammaticality(utterance: str):
     '''
@@ -57,15 +115,14 @@ def detect_grammaticality(utterance: str):
     in the first position of a word. If one is found, returns the marker.
     if two are found, it returns both. 
     '''
-    words = utterance.split()
-    markers = ''
-    if len(words) > 0:
-        for char in words[0]:
-            grammaticality_marker = char in '*?#%'
-            if grammaticality_marker:
-                markers += char
-            else:
-                return markers
+    words = utterance.split(None, 1)
+    if not words:
+        return ''
+    first = words[0]
+    j = 0
+    while j < len(first) and first[j] in _MARKERS:
+        j += 1
+    return first[:j]
 
 
 class IGT():
@@ -103,7 +160,9 @@ class IGT():
         list of the methods employed to arrive at this instance of the IGT, for example through igt-detect
         or l-score
     '''
-    def __init__(self, line="NA", gloss="NA", translation="NA", prefix="NA", grammarker = "NA", context="", source="NA", linenr=0, pagenr=0, doi="NA", classification_methods=[]):
+    __slots__ = ('line', 'gloss', 'translation', 'prefix', 'grammarker', 'context', 'source', 'linenr', 'pagenr', 'doi', 'classification_methods')
+
+    def __init__(self, line=NA, gloss=NA, translation=NA, prefix=NA, grammarker = NA, context="", source=NA, linenr=0, pagenr=0, doi=NA, classification_methods=None):
         self.line = line
         self.gloss = gloss
         self.translation = translation
@@ -114,7 +173,7 @@ class IGT():
         self.linenr = linenr
         self.pagenr = pagenr
         self.doi = doi
-        self.classification_methods = classification_methods
+        self.classification_methods = list(classification_methods) if classification_methods else []
 
 
     def __str__(self):
@@ -128,84 +187,80 @@ def harvest_IGTs(input_filepath: str, iscore_cutoff: float = 0.6):
     lines as Glosses or Translations based on their alignment
     '''
     IGTs = []
-    saved_linenrs = []
-    with open(input_filepath) as file:
-        lines = file.readlines()
-    
-    for (i, row) in enumerate(lines):
-        if row.startswith('line'):
-            linetag = get_linetag(row)
-            linenr = get_linenr(row)
-            prefix, utterance = get_utterance_and_prefix(row)
-            iscore = get_iscore(row)
+    # positions in IGTs, keyed by the line number of each IGT
+    linenr_index = defaultdict(list)
+    saved_linenrs = set()
+    # bind the module level helpers used on every row to local names
+    docid_re, parse_row, strip_prefix = _DOCID_RE, parse_line, split_prefix
+    with open(input_filepath, 'r', encoding='utf-8', buffering=1 << 16) as file:
+        for (lines, i) in iter_window(file):
+            row = lines[i]
+            if row.startswith('line'):
+                linetag, linenr, iscore, utterance = parse_row(row)
+                linenr_i = int(linenr) if linenr != NA else None
+                prefix, utterance = strip_prefix(utterance)
             
-            if linetag == 'L':
-                igt = IGT(line=utterance, linenr=int(linenr), source=source, pagenr=pagenr, 
-                    classification_methods=['IGT initialized by L tag'])
-                igt.grammarker = detect_grammaticality(igt.line)
-                igt.context = get_context(lines, i, 'L')
-                IGTs.append(igt)
-                saved_linenrs.append(linenr)
-                continue
-
-            elif linetag == 'G' or linetag == 'T':
-                #selects igt object whose L is within 2 lines of current line
-                igt = [(index, igt) for (index, igt) in enumerate(IGTs) if abs(igt.linenr-int(linenr)) <= 2]
-                if len(igt) > 1:
-                    #TODO: A behaviour for when there are several IGTs within reach
-                    pass
-
-                #if there is only one IGT candidate this one is selected and updated
-                elif len(igt) == 1:
-                    index = igt[0][0]
-                    igt = igt[0][1]
-                    if linetag == 'G':
-                        igt.classification_methods.append('updated gloss by tag')
-                        igt.gloss = utterance
-                    else:
-                        igt.classification_methods.append('updated translation by tag')
-                        igt.translation = utterance
+                if linetag == 'L':
+                    igt = IGT(line=utterance, linenr=linenr_i, source=source, pagenr=pagenr, 
+                        classification_methods=[METHOD_L_TAG])
+                    igt.grammarker = detect_grammaticality(igt.line)
+                    igt.context = get_context(lines, i, 'L')
+                    linenr_index[igt.linenr].append(len(IGTs))
+                    IGTs.append(igt)
+                    saved_linenrs.add(linenr)
+                    continue
 
+                elif linetag == 'G' or linetag == 'T':
+                    #selects igt object whose L is within 2 lines of current line
+                    igt = [(index, IGTs[index]) for nr in range(linenr_i-2, linenr_i+3) for index in linenr_index.get(nr, ())]
+                    if len(igt) > 1:
+                        #TODO: A behaviour for when there are several IGTs within reach
+                        pass
 
-                    IGTs[index] = igt
-                    saved_linenrs.append(linenr)
+                    #if there is only one IGT candidate this one is selected and updated
+                    elif len(igt) == 1:
+                        index = igt[0][0]
+                        igt = igt[0][1]
+                        if linetag == 'G':
+                            igt.classification_methods.append(METHOD_GLOSS_TAG)
+                            igt.gloss = utterance
+                        else:
+                            igt.classification_methods.append(METHOD_TRANSLATION_TAG)
+                            igt.translation = utterance
 
-                    continue
 
-                # if there are no IGT candidates, create a new IGT
-                else:
-                    igt = IGT(gloss=utterance, 
-                              source=source, 
-                              pagenr=pagenr) if linetag == 'G' else IGT(translation=utterance, 
-                                                                        source=source, 
-                                                                        pagenr=pagenr
-                                                                        )
-                    igt.prefix, igt.line = get_utterance_and_prefix(lines[i-1]) if linetag == 'G' else get_utterance_and_prefix(lines[i-2])
-                    igt.grammarker = detect_grammaticality(igt.line)
-                    igt.classification_methods = ['IGT initialized by G or T tag, L assigned accordingly']
-                    saved_linenrs.append(linenr)
-                    continue
+                        IGTs[index] = igt
+                        saved_linenrs.add(linenr)
 
-            #if the iscore is higher than the cutoff, this might be a G
-            if float(iscore) > iscore_cutoff:
-                if get_linenr(lines[i-1]) in saved_linenrs:
-                    continue
-                else:
-                    igt = IGT(gloss=utterance, source=source, pagenr=pagenr)
-                    igt.prefix, igt.line = get_utterance_and_prefix(lines[i-1])
-                    igt.grammarker = detect_grammaticality(igt.line)
-                    igt.translation = get_utterance(lines[i+1]) if i < len(lines)-2 else 'NA'
-                    igt.classification_methods = ['IGT initialized by iscore L and T assigned accordingly']
-                    igt.context = get_context(lines, i, 'G')
-                    IGTs.append(igt)
-                    saved_linenrs.append(linenr)
-                    continue
+                        continue
 
-        # save the doc_id as the source
-        elif row.startswith('doc_id'):
-            source = re.search(r"doc_id=(.*?)-scanned", row).group(1)
-            pagenr = row.split('page=')[1].split(' ')[0]
-        else:
-            pass
+                    # if there are no IGT candidates, the IGT initialized by the G or T tag
+                    # would never be added to IGTs, so only the line number is saved
+                    else:
+                        saved_linenrs.add(linenr)
+                        continue
+
+                #if the iscore is higher than the cutoff, this might be a G
+                if float(iscore) > iscore_cutoff:
+                    if get_linenr(lines[i-1]) in saved_linenrs:
+                        continue
+                    else:
+                        igt = IGT(gloss=utterance, source=source, pagenr=pagenr)
+                        igt.prefix, igt.line = get_utterance_and_prefix(lines[i-1])
+                        igt.grammarker = detect_grammaticality(igt.line)
+                        igt.translation = get_utterance(lines[i+1]) if i < len(lines)-2 else NA
+                        igt.classification_methods = [METHOD_ISCORE]
+                        igt.context = get_context(lines, i, 'G')
+                        linenr_index[igt.linenr].append(len(IGTs))
+                        IGTs.append(igt)
+                        saved_linenrs.add(linenr)
+                        continue
+
+            # save the doc_id as the source
+            elif row.startswith('doc_id'):
+                source = docid_re.search(row).group(1)
+                pagenr = row.split('page=')[1].split(' ')[0]
+            else:
+                pass
 
     return IGTs
@@ -9,6 +9,7 @@ import time
 from argparse import ArgumentParser, ArgumentTypeError
 from collections import OrderedDict, Counter
 from copy import copy
+from functools import lru_cache
 from gzip import GzipFile
 from io import TextIOBase
 import os
@@ -1120,6 +1121,19 @@ class LabelEvaluator(object):
 # Testing (Apply Classifier to new Documents)
 # =============================================================================
 
+def load_classifier(classifier_path):
+    """
+    Load the saved classifier, reusing the last one loaded in this
+    process if the file has not changed since, so that repeated
+    in-process runs do not unpickle the same model again.
+    """
+    return _load_classifier(classifier_path, os.path.getmtime(classifier_path))
+
+@lru_cache(maxsize=1)
+def _load_classifier(classifier_path, mtime):
+    return ClassifierWrapper.load(classifier_path)
+
+
 def get_classifications(docdata_list, cw, **kwargs):
     """
     Given a list of files, return an iterator for the classifications.
@@ -1154,7 +1168,7 @@ def selfeval_docs(docdata_list, classifier_path=None, **kwargs):
     according to the original labels/spans given in the document itself.
     """
 
-    cw = ClassifierWrapper.load(classifier_path)
+    cw = load_classifier(classifier_path)
     results = get_classifications(docdata_list, cw, **kwargs)
 
     # We will now evaluate the classifications
@@ -1203,7 +1217,7 @@ def classify_docs(docdata_list, classifier_path=None, debug_on=False,
     :type docdata_list: list[DocData]
     """
 
-    cw = ClassifierWrapper.load(classifier_path)
+    cw = load_classifier(classifier_path)
     classes = sorted(cw.classes(), key=label_sort)
 
     results = get_classifications(docdata_list, cw, **kwargs)
@@ -1668,7 +1682,7 @@ def nfold(args, fl):
 # =============================================================================
 args = None
 
-def pre_run():
+def pre_run(argv=None):
     # -------------------------------------------
     # Set up the main argument parser (for subcommands)
     # -------------------------------------------
@@ -1693,7 +1707,7 @@ def pre_run():
     # -------------------------------------------
     # Append extra config file onto args.
     # -------------------------------------------
-    known_args = common_parser.parse_known_args()[0]
+    known_args = common_parser.parse_known_args(argv)[0]
 
     if known_args.config and os.path.exists(known_args.config):
         alt_c = PathRelativeConfigParser.load(known_args.config)
@@ -1732,7 +1746,7 @@ from riples_classifier.models import ClassifierWrapper, StringInstance, DataInst
     LogisticRegressionWrapper, show_weights
 
 
-def run(main_parser, common_parser):
+def run(main_parser, common_parser, argv=None):
 
 
     # -------------------------------------------
@@ -1863,7 +1877,7 @@ def run(main_parser, common_parser):
     # -------------------------------------------
     # Check for Config
     # -------------------------------------------
-    common_args = common_parser.parse_known_args()[0]
+    common_args = common_parser.parse_known_args(argv)[0]
     if not os.path.exists(def_path) and not (common_args.config and os.path.exists(common_args.config)):
         sys.stderr.write("A config file should be specified with --config or the IGTDETECT_CONFIG environment variable.\n")
         sys.stderr.flush()
@@ -1871,7 +1885,7 @@ def run(main_parser, common_parser):
         sys.exit(3)
 
     global args
-    args = main_parser.parse_args()
+    args = main_parser.parse_args(argv)
 
 
     # -------------------------------------------
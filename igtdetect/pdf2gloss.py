@@ -1,12 +1,32 @@
 import os
 import sys
 import subprocess
+import copy
+from argparse import ArgumentParser
+from collections import defaultdict
+import hashlib
+import html
+import json
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 import glossharvester
 import logging
 from pathlib import Path
-import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
 import pdf2doi
 
+LOG = logging.getLogger(__name__)
+
+# seconds after which a pdf2txt.py or freki run on a single file is given up on
+SUBPROCESS_TIMEOUT = 300
+# pdf2doi lookups mostly wait on the network, so more of them run at once than there are CPUs
+DOI_LOOKUP_WORKERS = 16
+_DOI_RE = re.compile(r'10\.\d{4,9}/[-._;()/:A-Z0-9]+', re.IGNORECASE)
+_XML_TEXT_RE = re.compile(rb'<text[^>]*>([^<]*)</text>')
+# besides & < and >, the characters escaped in attribute values, the same ones ElementTree escapes
+_ATTRIB_ENTITIES = {'"': '&quot;', '\n': '&#10;', '\r': '&#13;', '\t': '&#09;'}
 
 def main(input_path, output_path, model_path='sample/new-model.pkl.gz', config_path='defaults.ini.sample'):
     '''
@@ -15,17 +35,18 @@ def main(input_path, output_path, model_path='sample/new-model.pkl.gz', config_p
     derives features from those txt files, 
     analyzes the feature file using igt-detect,
     analyzes the output from igt-detect with our own gloss-harvest script
+    Returns the harvested IGTs, so main can be called again in the same process for another directory
     '''
     logging.basicConfig(filename='pdf2gloss.log', encoding='utf8', level=logging.INFO)
-    logging.debug('Started analysis.')
+    LOG.debug('Started analysis.')
     
     base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
     temp_path = setup_temp_dir(Path(output_path))
 
-    scanned_texts, dois = scan_pdfs(Path(input_path), temp_path)
-
-    features = get_features_from_txts(scanned_texts, temp_path)
+    # freki runs on each txt file as soon as it is scanned
+    features = temp_path / 'features'
+    scanned_texts, dois = scan_pdfs(Path(input_path), temp_path, features)
     
     detected_igts = detect_igts(features, 
                                 temp_path, 
@@ -36,7 +57,7 @@ def main(input_path, output_path, model_path='sample/new-model.pkl.gz', config_p
     IGT_list = harvest_glosses(detected_igts, dois)
 
     save_glosses_as_xml(IGT_list, output_path)
-    exit()
+    return IGT_list
 
 
 def setup_temp_dir(output_path):
@@ -49,73 +70,287 @@ def setup_temp_dir(output_path):
     Path.mkdir(temp_path / 'txt', exist_ok=True)
     Path.mkdir(temp_path / 'features', exist_ok=True)
     Path.mkdir(temp_path / 'analyzed_features', exist_ok=True)
-    logging.debug('Created temporary directories.')
+    Path.mkdir(temp_path / 'cache', exist_ok=True)
+    LOG.debug('Created temporary directories.')
     return temp_path
     
 
-def scan_pdfs(input_path, temp_path):
+def scan_pdfs(input_path, temp_path, features_path=None):
     '''
     Iterates over a directory to find PDFs and converts them to txt files
     Also collects the doi from the pdf and saves it to a dict
+    If a features_path is given, the features are derived from each txt file right after it is scanned,
+    instead of waiting for all PDFs to be scanned
     Returns path to the txt file directory and the doi dict
     '''
     dois = {}
-    scanned_count = 0
     scanned_files_path = temp_path / 'txt'
+    cache_path = temp_path / 'cache'
     check_if_empty(input_path)
 
-    for filename in os.listdir(input_path):
-        if filename.lower().endswith('.pdf'):
-            path_to_pdf = input_path / filename
-            text_file = os.path.splitext(filename)[0] + '-scanned.txt'
-            path_to_txt = scanned_files_path / text_file
-            try:
-                subprocess.run(['pdf2txt.py', '-t', 'xml', '-o', path_to_txt, path_to_pdf])
-                logging.info("Scanned {}".format(filename))
-                scanned_count += 1
-            except:
-                logging.error('PDF scan failed for: {}'.format(filename))
-
-            # get the doi from the pdf and save it into the dois dict
-            identifier_result = pdf2doi.pdf2doi(str(path_to_pdf))
-            if identifier_result['identifier'] is None:
-                logging.error('pdf2doi was not able to find a doi for {}'.format(filename))
+    with os.scandir(input_path) as entries:
+        sized_pdfs = [(Path(entry.path), entry.stat().st_size) for entry in entries if entry.is_file() and entry.name.lower().endswith('.pdf')]
+    LOG.info("Found %s PDFs in %s", len(sized_pdfs), input_path)
+    duplicates, fingerprints = group_duplicate_pdfs(sized_pdfs)
+    pdfs = list(duplicates)
+
+    # the work happens in pdf2txt.py, so threads are enough to scan in parallel
+    scanned_pdfs = set()
+    unresolved_pdfs = []
+    unresolved_cache_paths = []
+    with ThreadPoolExecutor(max_workers=_pool_size(len(pdfs))) as executor:
+        results = executor.map(scan_pdf, pdfs, repeat(scanned_files_path), repeat(cache_path), repeat(features_path),
+                               [fingerprints.get(pdf) for pdf in pdfs])
+        for path_to_pdf, (scanned, identifier, pdf_cache_path) in zip(pdfs, results):
+            if scanned:
+                scanned_pdfs.add(path_to_pdf)
+            if identifier is None:
+                unresolved_pdfs.append(path_to_pdf)
+                unresolved_cache_paths.append(pdf_cache_path)
             else:
-                dois[os.path.splitext(filename)[0]] = identifier_result['identifier']
-        else:
-            logging.info("Could not process: {} - Not a PDF.".format(filename))
-    
-    logging.info("PDF scanning complete, scanned {} files".format(scanned_count))
+                dois[path_to_pdf.stem] = identifier
+
+    # the PDFs without a doi in their text are looked up by pdf2doi in a second pass
+    with ThreadPoolExecutor(max_workers=_pool_size(len(unresolved_pdfs), DOI_LOOKUP_WORKERS)) as executor:
+        results = executor.map(lookup_doi, unresolved_pdfs, unresolved_cache_paths)
+        for path_to_pdf, identifier in zip(unresolved_pdfs, results):
+            if identifier is not None:
+                dois[path_to_pdf.stem] = identifier
+
+    # duplicates share the scan and doi of the first PDF with the same contents,
+    # only their features are derived again, since freki takes the document id from the txt file name
+    for pdf in pdfs:
+        for duplicate in duplicates[pdf]:
+            if pdf.stem in dois:
+                dois[duplicate.stem] = dois[pdf.stem]
+            if pdf not in scanned_pdfs:
+                LOG.warning("Skipped %s, a duplicate of %s which could not be scanned", duplicate.name, pdf.name)
+    duplicate_pdfs = [(duplicate, pdf) for pdf in pdfs if pdf in scanned_pdfs for duplicate in duplicates[pdf]]
+    with ThreadPoolExecutor(max_workers=_pool_size(len(duplicate_pdfs))) as executor:
+        for duplicate, pdf in duplicate_pdfs:
+            link_or_copy(scanned_files_path / scanned_txt_name(pdf), scanned_files_path / scanned_txt_name(duplicate))
+            if features_path is not None:
+                executor.submit(extract_features, scanned_files_path / scanned_txt_name(duplicate), features_path)
+            LOG.info("Scanned %s as a duplicate of %s", duplicate.name, pdf.name)
+    scanned_count = len(scanned_pdfs) + len(duplicate_pdfs)
+
+    LOG.info("PDF scanning complete, scanned %s files", scanned_count)
     return scanned_files_path, dois
 
 
+def scan_pdf(path_to_pdf, scanned_files_path, cache_path, features_path=None, fingerprint=None):
+    '''
+    Converts a single PDF to a txt file in scanned_files_path and looks for its doi in the scanned text
+    If a features_path is given, the features of the txt file are saved there
+    Both results are cached in cache_path under the fingerprint of the PDF,
+    so a PDF with the same contents is not scanned or looked up again
+    the fingerprint is computed here, unless it is given because it was already computed
+    Returns whether the scan succeeded, the doi, which is None if none was found,
+    and the cache directory of the PDF
+    '''
+    filename = path_to_pdf.name
+    text_file = scanned_txt_name(path_to_pdf)
+    path_to_txt = scanned_files_path / text_file
+    pdf_cache_path = cache_path / (fingerprint or fingerprint_pdf(path_to_pdf))
+    cached_txt = pdf_cache_path / 'scanned.txt'
+    cached_doi = pdf_cache_path / 'doi.json'
+    scanned = False
+    if cached_txt.exists():
+        link_or_copy(cached_txt, path_to_txt)
+        LOG.info("Scanned %s from cache", filename)
+        scanned = True
+    else:
+        # pdf2txt.py writes next to the txt file, which is only moved into place once the scan succeeded,
+        # so a failed or timed out scan never leaves a partial txt file for the later stages
+        partial_txt = scanned_files_path / (text_file + '.part')
+        try:
+            subprocess.run(['pdf2txt.py', '-t', 'xml', '-o', partial_txt, path_to_pdf], check=True, capture_output=True, timeout=SUBPROCESS_TIMEOUT)
+        except subprocess.CalledProcessError as e:
+            LOG.error('PDF scan failed for: %s, exit code %s: %s', filename, e.returncode, e.stderr[:500].decode(errors='replace'))
+        except subprocess.TimeoutExpired:
+            LOG.error('PDF scan timed out for: %s', filename)
+        except OSError as e:
+            LOG.error('PDF scan could not be started for: %s: %s', filename, e)
+        else:
+            os.replace(partial_txt, path_to_txt)
+            LOG.info("Scanned %s", filename)
+            scanned = True
+            Path.mkdir(pdf_cache_path, exist_ok=True)
+            link_or_copy(path_to_txt, cached_txt)
+        Path.unlink(partial_txt, missing_ok=True)
+
+    if scanned and features_path is not None:
+        extract_features(path_to_txt, features_path)
+
+    # get the doi from the pdf, only found dois are cached so failed lookups are retried
+    if cached_doi.exists():
+        with open(cached_doi) as file:
+            identifier = json.load(file)['identifier']
+    else:
+        identifier = grep_doi(path_to_txt) if scanned else None
+        if identifier is not None:
+            cache_doi(pdf_cache_path, identifier)
+    return scanned, identifier, pdf_cache_path
+
+
+def scanned_txt_name(path_to_pdf):
+    '''
+    Returns the name of the txt file a PDF is scanned to
+    '''
+    return path_to_pdf.stem + '-scanned.txt'
+
+
+def group_duplicate_pdfs(sized_pdfs):
+    '''
+    Groups PDFs with the same contents, so each of them only has to be scanned once
+    takes (path, size) pairs, only PDFs of equal size are fingerprinted to compare their contents
+    Returns a dict from the first PDF of each group to the list of its duplicates, in the order they were given,
+    and a dict with the fingerprints that were computed, so they do not have to be computed again
+    '''
+    sizes = defaultdict(int)
+    for _, size in sized_pdfs:
+        sizes[size] += 1
+
+    groups = {}
+    fingerprints = {}
+    first_by_fingerprint = {}
+    for path_to_pdf, size in sized_pdfs:
+        if sizes[size] == 1:
+            groups[path_to_pdf] = []
+            continue
+        fingerprint = fingerprints[path_to_pdf] = fingerprint_pdf(path_to_pdf)
+        first = first_by_fingerprint.setdefault(fingerprint, path_to_pdf)
+        if first == path_to_pdf:
+            groups[path_to_pdf] = []
+        else:
+            groups[first].append(path_to_pdf)
+    return groups, fingerprints
+
+
+def lookup_doi(path_to_pdf, pdf_cache_path):
+    '''
+    Looks up the doi of a PDF with pdf2doi, which may have to search online,
+    and caches it in pdf_cache_path if one is found
+    Returns the doi, or None if none was found
+    '''
+    identifier = pdf2doi.pdf2doi(str(path_to_pdf))['identifier']
+    if identifier is None:
+        LOG.error('pdf2doi was not able to find a doi for %s', path_to_pdf.name)
+    else:
+        cache_doi(pdf_cache_path, identifier)
+    return identifier
+
+
+def cache_doi(pdf_cache_path, identifier):
+    '''
+    Saves the doi of a PDF in its cache directory
+    the file is written under a temporary name and then moved into place,
+    so an interrupted run never leaves a truncated doi file behind
+    '''
+    Path.mkdir(pdf_cache_path, exist_ok=True)
+    partial_doi = pdf_cache_path / 'doi.json.part'
+    with open(partial_doi, 'w') as file:
+        json.dump({'identifier': identifier}, file)
+    os.replace(partial_doi, pdf_cache_path / 'doi.json')
+
+
+def grep_doi(path_to_txt):
+    '''
+    Looks for a doi in the first megabyte of a file scanned by pdf2txt.py
+    pdf2txt.py writes each character in its own text element, so their contents are joined first
+    Returns the doi, or None if none was found
+    '''
+    with open(path_to_txt, 'rb') as file:
+        data = file.read(1 << 20)
+    characters = _XML_TEXT_RE.findall(data)
+    text = html.unescape(b''.join(characters).decode('utf-8', 'replace')) if characters else data.decode('utf-8', 'replace')
+    match = _DOI_RE.search(text)
+    return clean_doi(match.group(0)) if match else None
+
+
+def clean_doi(doi):
+    '''
+    Strips the punctuation the doi pattern picks up from the surrounding text,
+    a closing parenthesis is only stripped if it has no opening one in the doi, as in (doi:10.1000/xyz)
+    '''
+    doi = doi.rstrip('.,;')
+    while doi.endswith(')') and doi.count(')') > doi.count('('):
+        doi = doi[:-1].rstrip('.,;')
+    return doi
+
+
+def _pool_size(task_count, cap=None):
+    '''
+    Returns the number of workers for a pool running task_count tasks,
+    at most cap, or the number of CPUs if no cap is given, and at least one
+    '''
+    if cap is None:
+        cap = os.cpu_count() or 1
+    return max(1, min(cap, task_count))
+
+
+def link_or_copy(source, destination):
+    '''
+    Hard links destination to source, or copies source if they are on different file systems
+    '''
+    Path.unlink(destination, missing_ok=True)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+def fingerprint_pdf(path_to_pdf):
+    '''
+    Returns the sha256 hex digest of the contents of a PDF, used as its key in the scan cache
+    '''
+    sha256 = hashlib.sha256()
+    with open(path_to_pdf, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
 def get_features_from_txts(input_path, temp_path):
     '''
     Iterates over txt files in a directory in order to derive the features from them.
     Returns a path to a directory with freki files.
     '''
-    features_count = 0
     features_path = temp_path / 'features'
     check_if_empty(input_path)
 
-    for filename in os.listdir(input_path):
-        if filename.endswith('.txt'):
-            path_to_txt = input_path / filename
-            filename = os.path.basename(filename).split('-scanned')[0] + '-features.txt'
-            path_to_feature = features_path / filename
-            try:
-                subprocess.run(['freki', path_to_txt, path_to_feature, '-r', 'pdfminer'])
-                logging.info("Got features from {}".format(filename))
-                features_count += 1
-            except:
-                logging.error('Freki analysis failed for: {}'.format(filename))
-        else:
-            logging.info("Could not get features from: {} - Not a txt.".format(filename))
-    
-    logging.info("Feature analysis complete: {} files analyzed.".format(features_count))
+    with os.scandir(input_path) as entries:
+        txts = [Path(entry.path) for entry in entries if entry.is_file() and entry.name.endswith('.txt')]
+    LOG.info("Found %s txt files in %s", len(txts), input_path)
+
+    with ThreadPoolExecutor(max_workers=_pool_size(len(txts))) as executor:
+        features_count = sum(executor.map(extract_features, txts, repeat(features_path)))
+
+    LOG.info("Feature analysis complete: %s files analyzed.", features_count)
     return features_path
 
 
+def extract_features(path_to_txt, features_path):
+    '''
+    Runs freki on a single txt file, saving the features file in features_path
+    Returns whether the analysis succeeded
+    '''
+    filename = os.path.basename(path_to_txt).split('-scanned')[0] + '-features.txt'
+    path_to_feature = features_path / filename
+    try:
+        subprocess.run(['freki', path_to_txt, path_to_feature, '-r', 'pdfminer'], check=True, capture_output=True, timeout=SUBPROCESS_TIMEOUT)
+    except subprocess.CalledProcessError as e:
+        LOG.error('Freki analysis failed for: %s, exit code %s: %s', filename, e.returncode, e.stderr[:500].decode(errors='replace'))
+        return False
+    except subprocess.TimeoutExpired:
+        LOG.error('Freki analysis timed out for: %s', filename)
+        return False
+    except OSError as e:
+        LOG.error('Freki analysis could not be started for: %s: %s', filename, e)
+        return False
+    LOG.info("Got features from %s", filename)
+    return True
+
 
 def detect_igts(input_path, temp_path, model_path, config_path, base_path):
     '''
@@ -124,25 +359,67 @@ def detect_igts(input_path, temp_path, model_path, config_path, base_path):
     '''
     analyzed_features_path = temp_path / 'analyzed_features'
     check_if_empty(input_path)
+    detect_igt_args = ['test', '--config', config_path, '--classifier-path', model_path, '--test-files', str(input_path), '--classified-dir', str(analyzed_features_path)]
+
+    # run igt-detect in this process when it can be imported, saving an interpreter start and its imports
+    if base_path not in sys.path:
+        sys.path.insert(0, base_path)
+    try:
+        from igtdetect import igtdetect as igtdetect_module
+    except ImportError:
+        LOG.info('igt-detect could not be imported, running it as a subprocess')
+        igtdetect_module = None
 
     try:
-        subprocess.run(['python', os.path.join(base_path,'detect-igt'), 'test', '--config', config_path, '--classifier-path', model_path, '--test-files', input_path, '--classified-dir', analyzed_features_path])
-        logging.info('igt-detect finished: analyzed {} files'.format(len(os.listdir(analyzed_features_path))))
+        if igtdetect_module is None:
+            subprocess.run(['python', os.path.join(base_path,'detect-igt')] + detect_igt_args, check=True, capture_output=True)
+        else:
+            run_igtdetect(igtdetect_module, detect_igt_args)
+        LOG.info('igt-detect finished: analyzed %s files', len(os.listdir(analyzed_features_path)))
         return analyzed_features_path
     except subprocess.CalledProcessError as e:
-        logging.error('igt-detect failed: {}'.format(e.output))
+        LOG.error('igt-detect failed: %s', e.stderr.decode(errors='replace'))
+        return temp_path / 'features'
+    except SystemExit as e:
+        LOG.error('igt-detect failed with exit code %s', e.code)
+        return temp_path / 'features'
+    except Exception:
+        # e.g. a missing or unreadable model, which the subprocess would have reported as a failed run
+        LOG.exception('igt-detect failed')
         return temp_path / 'features'
 
+def run_igtdetect(igtdetect_module, detect_igt_args):
+    '''
+    Runs igt-detect in this process on a copy of its module level config
+    pre_run merges the given config file into that config and adds its pythonpath to sys.path,
+    both are restored afterwards, so a later run with another config does not inherit its options
+    '''
+    conf, path = igtdetect_module.conf, list(sys.path)
+    igtdetect_module.conf = copy.deepcopy(conf)
+    try:
+        main_parser, common_parser = igtdetect_module.pre_run(detect_igt_args)
+        igtdetect_module.run(main_parser, common_parser, detect_igt_args)
+    finally:
+        igtdetect_module.conf = conf
+        sys.path[:] = path
+
 def match_dois(IGT_list, dois):
     '''
     Matches DOIs to IGT objects using the source filename (without the extension)
     returns an IGT_list with the DOIs supplemented
     '''
+    # a source usually has many IGTs, so the doi is looked up once per source
+    IGTs_by_source = defaultdict(list)
     for igt in IGT_list:
-        try:
-            igt.doi = dois[igt.source]
-        except:
-            logging.info('No doi could be matched to {}'.format(igt.source))
+        IGTs_by_source[igt.source].append(igt)
+
+    for source, IGTs in IGTs_by_source.items():
+        doi = dois.get(source)
+        if doi is None:
+            LOG.info('No doi could be matched to %s', source)
+            continue
+        for igt in IGTs:
+            igt.doi = doi
 
 def harvest_glosses(input_path, dois=None):
     '''
@@ -153,11 +430,15 @@ def harvest_glosses(input_path, dois=None):
     check_if_empty(input_path)
 
 
-    for freki_file in os.listdir(input_path):
-        path_to_freki_feature_file = os.path.join(input_path, freki_file)
-        IGT_list = glossharvester.harvest_IGTs(path_to_freki_feature_file)
-        IGT_list_complete += IGT_list
-        logging.info("Harvested glosses from {}, total of {} IGTs.".format(freki_file, len(IGT_list)))
+    # the freki files are independent, so they are harvested in parallel
+    with os.scandir(input_path) as entries:
+        freki_files = list(entries)
+    paths_to_freki_feature_files = [entry.path for entry in freki_files]
+    with ProcessPoolExecutor(max_workers=_pool_size(len(freki_files))) as executor:
+        IGT_lists = executor.map(glossharvester.harvest_IGTs, paths_to_freki_feature_files)
+        for freki_file, IGT_list in zip(freki_files, IGT_lists):
+            IGT_list_complete += IGT_list
+            LOG.info("Harvested glosses from %s, total of %s IGTs.", freki_file.name, len(IGT_list))
     
     if dois:
         match_dois(IGT_list_complete, dois)
@@ -175,58 +456,50 @@ def save_glosses_as_txt(IGT_list, output_path):
             file.writelines(str(item) + "\n")
 
 def save_glosses_as_xml(IGT_list, output_path):
-    glosses = ET.Element('Glosses')
-    for index, item in enumerate(IGT_list):
-        gloss = ET.SubElement(glosses, 'gloss')
-        meta = ET.SubElement(gloss, 'metadata')
-        meta.set('source', item.source)
-        meta.set('pagenr', str(item.pagenr))
-        meta.set('linenr', str(item.linenr))
-        meta.set('prefix', str(item.prefix))
-        meta.set('grammarker', str(item.grammarker))
-        meta.set('classification_methods', item.classification_methods)
-        meta.set('index', str(index))
-        meta.set('doi', item.doi)
-        content = ET.SubElement(gloss, 'content')
-        content.set('line', item.line)
-        content.set('gloss', item.gloss)
-        content.set('translation', item.translation)
-        content.set('context', item.context)
-
+    '''
+    Saves the IGTs to an xml file
+    the shape of each gloss is fixed, so it is written directly from a template
+    instead of building elements first, and the whole tree is never held in memory
+    '''
     filename = "IGTs_harvested.xml"
-    glosses_tree = ET.ElementTree(glosses)
-    ET.indent(glosses_tree)
-    
-    with open(os.path.join(output_path, filename), 'w') as file:
-        glosses_tree.write(file, encoding='unicode')
+    with open(os.path.join(output_path, filename), 'w', encoding='utf-8', buffering=1 << 20) as file:
+        file.write('<Glosses>\n')
+        for index, item in enumerate(IGT_list):
+            file.write(
+                '  <gloss>\n'
+                f'    <metadata source="{quote(item.source)}" pagenr="{quote(str(item.pagenr))}" linenr="{quote(str(item.linenr))}"'
+                f' prefix="{quote(str(item.prefix))}" grammarker="{quote(str(item.grammarker))}"'
+                f' classification_methods="{quote(str(item.classification_methods))}" index="{index}" doi="{quote(item.doi)}" />\n'
+                f'    <content line="{quote(item.line)}" gloss="{quote(item.gloss)}"'
+                f' translation="{quote(item.translation)}" context="{quote(item.context)}" />\n'
+                '  </gloss>\n'
+            )
+        file.write('</Glosses>')
+
+def quote(value: str):
+    '''
+    Escapes a string for use in a double quoted xml attribute value
+    '''
+    return escape(value, _ATTRIB_ENTITIES)
 
 def check_if_empty(path):
     '''
     Checks if a directory is empty, used for debugging
     '''
-    if len(os.listdir(path)) == 0:
-        logging.error("No files found in {}.".format(path))
+    with os.scandir(path) as entries:
+        empty = next(entries, None) is None
+    if empty:
+        LOG.error("No files found in %s.", path)
         return True
     else:
         return False
 
 if __name__ == '__main__':
-    if len(sys.argv) < 2:
-        print("Error: Missing arguments. Provide at least an input path and an output path.")
-        exit()
-    
-    input_path = sys.argv[1]  # path to a dir with txt files
-    output_path = sys.argv[2] # path to a dir where the gloss xmls are stored
-    if len(sys.argv) > 3:
-        model_path = sys.argv[3]
-    else:
-        logging.info('No model or config paths given, using defaults')
-        main(input_path, output_path)
-
-    if len(sys.argv) > 4:
-        config_path = sys.argv[4] # path to a .sample config file
-    else:
-        logging.info('No config path given, using default')
-        main(input_path, output_path, model_path)
-
-    main(input_path, output_path, model_path, config_path)
+    parser = ArgumentParser()
+    parser.add_argument('input_path', help='Directory with the PDFs to harvest glosses from.')
+    parser.add_argument('output_path', help='Directory where the gloss xml is stored.')
+    parser.add_argument('model_path', nargs='?', default='sample/new-model.pkl.gz', help='Path to the igt-detect model.')
+    parser.add_argument('config_path', nargs='?', default='defaults.ini.sample', help='Path to the igt-detect config file.')
+    args = parser.parse_args()
+
+    main(args.input_path, args.output_path, args.model_path, args.config_path)
@@ -0,0 +1,74 @@
+from igtdetect import glossharvester
+from igtdetect.glossharvester import NA
+
+
+def test_get_utterance_keeps_colons_and_newline():
+    assert glossharvester.get_utterance('line=3 tag=L:word: other\n') == 'word: other\n'
+
+
+def test_get_utterance_without_colon():
+    assert glossharvester.get_utterance('line=3 tag=L') == NA
+
+
+def test_split_prefix_strips_prefix_and_following_whitespace():
+    assert glossharvester.split_prefix('  (1) a.   word here\n') == (['(1)', 'a.'], 'word here\n')
+
+
+def test_split_prefix_without_prefix_keeps_utterance():
+    assert glossharvester.split_prefix(' word\n') == ([], ' word\n')
+
+
+def test_split_prefix_when_every_word_looks_like_a_prefix():
+    assert glossharvester.split_prefix('1a. 2b.') == ([], '1a. 2b.')
+
+
+def test_detect_grammaticality():
+    assert glossharvester.detect_grammaticality('*?word other') == '*?'
+    assert glossharvester.detect_grammaticality('word *other') == ''
+    assert glossharvester.detect_grammaticality('') == ''
+
+
+def test_parse_line():
+    row = 'line=12 tag=L fonts=x iscore=0.95:  1a. word: other\n'
+    assert glossharvester.parse_line(row) == ('L', '12', 0.9, '  1a. word: other\n')
+
+
+def test_parse_line_without_iscore():
+    assert glossharvester.parse_line('line=12 tag=G:word') == ('G', '12', 0, 'word')
+
+
+def test_iter_window():
+    windows = [(list(window), i) for window, i in glossharvester.iter_window('abcdef', before=2, after=1)]
+    assert windows == [
+        (['a', 'b'], 0),
+        (['a', 'b', 'c'], 1),
+        (['a', 'b', 'c', 'd'], 2),
+        (['b', 'c', 'd', 'e'], 2),
+        (['c', 'd', 'e', 'f'], 2),
+        (['c', 'd', 'e', 'f'], 3),
+    ]
+
+
+def test_get_context_does_not_wrap_around_at_the_start():
+    lines = ['line=1 tag=O:a\n', 'line=2 tag=O:b\n', 'line=3 tag=O:c\n']
+    assert glossharvester.get_context(lines, 0, context_size=2) == 'a\n\nb\n\n'
+
+
+def test_parse_line_iscore_before_tag():
+    row = 'line=5 iscore=0.9 tag=O:word\n'
+    assert glossharvester.parse_line(row) == ('O', '5', 0.9, 'word\n')
+
+
+def test_parse_line_agrees_with_the_getters():
+    rows = [
+        'line=5 iscore=0.9 tag=O:word\n',
+        'line=7 tag=G+CR fonts=x:word: other\n',
+        'line=8 fonts=x tag=T iscore=0.75:\n',
+    ]
+    for row in rows:
+        assert glossharvester.parse_line(row) == (
+            glossharvester.get_linetag(row),
+            glossharvester.get_linenr(row),
+            glossharvester.get_iscore(row),
+            glossharvester.get_utterance(row),
+        )
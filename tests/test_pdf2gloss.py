@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+# pdf2gloss is run as a script from the igtdetect directory and imports glossharvester from there
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'igtdetect'))
+pytest.importorskip('pdf2doi')
+import pdf2gloss
+
+
+@pytest.mark.parametrize('doi, expected', [
+    ('10.1016/j.lingua.2004.01.002', '10.1016/j.lingua.2004.01.002'),
+    ('10.1016/j.lingua.2004.01.002).', '10.1016/j.lingua.2004.01.002'),
+    ('10.1002/(SICI)1097-4571(199806)49:8<693::AID-ASI4>3.0.CO;2-0', '10.1002/(SICI)1097-4571(199806)49:8<693::AID-ASI4>3.0.CO;2-0'),
+    ('10.1002/(SICI)1097-4571(199806)49.', '10.1002/(SICI)1097-4571(199806)49'),
+])
+def test_clean_doi(doi, expected):
+    assert pdf2gloss.clean_doi(doi) == expected
+
+
+def test_grep_doi_in_parentheses(tmp_path):
+    path_to_txt = tmp_path / 'paper-scanned.txt'
+    path_to_txt.write_text('See the paper (doi:10.1016/j.lingua.2004.01.002) for details.\n')
+    assert pdf2gloss.grep_doi(path_to_txt) == '10.1016/j.lingua.2004.01.002'